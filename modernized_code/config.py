@@ -6,9 +6,18 @@ Handles loading and saving configuration settings.
 """
 
 import os
+import copy
 import json
+import atexit
 import logging
-from typing import Dict, Any
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +46,8 @@ DEFAULT_CONFIG = {
     "strategies": {
         "moving_average_crossover": {
             "fast_period": 9,
-            "slow_period": 20
+            "slow_period": 20,
+            "ma_type": "sma"
         },
         "rsi_strategy": {
             "period": 14,
@@ -55,45 +65,107 @@ DEFAULT_CONFIG = {
 # Configuration file path
 CONFIG_FILE = os.path.expanduser("~/.traderbot/config.json")
 
+# In-process cache of the configuration file, keyed by its modification time
+_CONFIG_CACHE: Optional[Dict[str, Any]] = None
+_CONFIG_MTIME_NS: int = 0
+
+# Seconds during which update_config calls are coalesced into one write
+SAVE_DELAY = 1.0
+
+# Pending debounced write
+_PENDING_CONFIG: Optional[Dict[str, Any]] = None
+_SAVE_TIMER: Optional[threading.Timer] = None
+_SAVE_LOCK = threading.Lock()
+
 
 def load_config() -> Dict[str, Any]:
-    """Load configuration from file or create default if not exists."""
+    """
+    Load configuration from file or create default if not exists.
+    
+    The parsed file is cached in-process and only re-read when its
+    modification time changes. Each call returns a copy of the cached
+    configuration, so callers may modify it freely; use update_config()
+    or save_config() to change the stored configuration.
+    """
+    return copy.deepcopy(_cached_config())
+
+
+def _cached_config() -> Dict[str, Any]:
+    """Return the cached configuration, loading or creating the file as needed."""
+    global _CONFIG_CACHE, _CONFIG_MTIME_NS
+    
     try:
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, 'r') as f:
-                config = json.load(f)
-                logger.info("Configuration loaded from %s", CONFIG_FILE)
-                return config
+        try:
+            mtime_ns = os.stat(CONFIG_FILE).st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        
+        if mtime_ns is not None:
+            if _CONFIG_CACHE is not None and mtime_ns == _CONFIG_MTIME_NS:
+                return _CONFIG_CACHE
+            
+            config = json.loads(Path(CONFIG_FILE).read_bytes())
+            _CONFIG_CACHE = config
+            _CONFIG_MTIME_NS = mtime_ns
+            logger.info("Configuration loaded from %s", CONFIG_FILE)
+            return config
         else:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-            save_config(DEFAULT_CONFIG)
+            if not save_config(DEFAULT_CONFIG):
+                return copy.deepcopy(DEFAULT_CONFIG)
             logger.info("Default configuration created at %s", CONFIG_FILE)
-            return DEFAULT_CONFIG
+            # save_config cached its own copy of the defaults
+            return _CONFIG_CACHE
     except Exception as e:
         logger.error("Error loading configuration: %s", str(e))
         logger.info("Using default configuration")
-        return DEFAULT_CONFIG
+        return copy.deepcopy(DEFAULT_CONFIG)
 
 
 def save_config(config: Dict[str, Any]) -> bool:
-    """Save configuration to file."""
+    """Save configuration to file and refresh the in-process cache."""
+    global _CONFIG_CACHE, _CONFIG_MTIME_NS
+    
     try:
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
         
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=4)
+        # Both paths write 2-space indented JSON, the only indent orjson supports
+        if orjson is not None:
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(config, indent=2).encode()
+        Path(CONFIG_FILE).write_bytes(data)
+        _CONFIG_CACHE = copy.deepcopy(config)
+        _CONFIG_MTIME_NS = os.stat(CONFIG_FILE).st_mtime_ns
         logger.info("Configuration saved to %s", CONFIG_FILE)
         return True
     except Exception as e:
         logger.error("Error saving configuration: %s", str(e))
+        # The cache may hold unsaved update_config changes; re-read the file on the next load
+        _CONFIG_CACHE = None
+        _CONFIG_MTIME_NS = 0
         return False
 
 
 def update_config(section: str, key: str, value: Any) -> bool:
-    """Update a specific configuration value."""
-    config = load_config()
+    """
+    Update a specific configuration value.
+    
+    The in-process configuration is updated immediately; the file write is
+    deferred by SAVE_DELAY seconds so that several updates share one write.
+    If that write fails, the update is discarded and the next load_config()
+    re-reads the file. Call flush_config() to write pending changes right away.
+    
+    Returns:
+        True once the value is updated and the write is scheduled. The deferred
+        write does not report back here; flush_config() returns whether it succeeded.
+    """
+    global _PENDING_CONFIG, _SAVE_TIMER
+    
+    # Update the cached configuration itself so pending updates accumulate
+    config = _cached_config()
     
     # Create section if it doesn't exist
     if section not in config:
@@ -102,15 +174,42 @@ def update_config(section: str, key: str, value: Any) -> bool:
     # Update value
     config[section][key] = value
     
-    # Save updated config
+    # Schedule a save of the updated config
+    with _SAVE_LOCK:
+        _PENDING_CONFIG = config
+        if _SAVE_TIMER is None:
+            _SAVE_TIMER = threading.Timer(SAVE_DELAY, flush_config)
+            _SAVE_TIMER.daemon = True
+            _SAVE_TIMER.start()
+    
+    return True
+
+
+def flush_config() -> bool:
+    """Write configuration changes still pending from update_config."""
+    global _PENDING_CONFIG, _SAVE_TIMER
+    
+    with _SAVE_LOCK:
+        if _SAVE_TIMER is not None:
+            _SAVE_TIMER.cancel()
+            _SAVE_TIMER = None
+        config, _PENDING_CONFIG = _PENDING_CONFIG, None
+    
+    if config is None:
+        return True
     return save_config(config)
 
 
+# Make sure debounced updates reach the file on interpreter exit
+atexit.register(flush_config)
+
+
 def get_api_keys() -> tuple:
     """Get Binance API keys from configuration."""
     config = load_config()
-    api_key = config.get("api", {}).get("binance", {}).get("api_key", "")
-    api_secret = config.get("api", {}).get("binance", {}).get("api_secret", "")
-    testnet = config.get("api", {}).get("binance", {}).get("testnet", True)
+    binance = config.get("api", {}).get("binance", {})
+    api_key = binance.get("api_key", "")
+    api_secret = binance.get("api_secret", "")
+    testnet = binance.get("testnet", True)
     
     return api_key, api_secret, testnet
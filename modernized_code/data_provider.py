@@ -5,17 +5,76 @@ Data Provider Module
 Handles fetching data from Binance API, both real-time and historical.
 """
 
+import re
+import socket
 import time
 import logging
 import json
 from typing import Dict, List, Optional, Union, Tuple
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import websocket
 from threading import Thread, Lock
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional
+    _json_loads = json.loads
+
+try:
+    import msgspec
+except ImportError:  # msgspec is optional
+    msgspec = None
+
 logger = logging.getLogger(__name__)
 
+# Stream name of a combined-stream frame, e.g. {"stream":"btcusdt@trade","data":{...}}
+_STREAM_NAME_RE = re.compile(r'"stream"\s*:\s*"([^"]+)"')
+
+if msgspec is not None:
+    class _Kline(msgspec.Struct):
+        """Kline payload of a kline stream frame."""
+        t: int
+        o: float
+        h: float
+        l: float
+        c: float
+        v: float
+        T: int
+        x: bool = False
+    
+    class _KlineEvent(msgspec.Struct):
+        """Data section of a kline stream frame."""
+        k: _Kline
+    
+    class _KlineFrame(msgspec.Struct):
+        """Combined-stream frame carrying a kline update."""
+        data: _KlineEvent
+    
+    class _Trade(msgspec.Struct):
+        """Data section of a trade stream frame."""
+        T: int
+        p: float
+        q: float
+        m: bool = False
+    
+    class _TradeFrame(msgspec.Struct):
+        """Combined-stream frame carrying a trade."""
+        data: _Trade
+    
+    # Binance sends prices as strings; non-strict mode parses them as floats
+    _KLINE_DECODER = msgspec.json.Decoder(_KlineFrame, strict=False)
+    _TRADE_DECODER = msgspec.json.Decoder(_TradeFrame, strict=False)
+else:
+    _KLINE_DECODER = None
+    _TRADE_DECODER = None
+
 
 class BinanceDataProvider:
     """Provider for Binance market data."""
@@ -45,6 +104,51 @@ class BinanceDataProvider:
         "1M": 2592000
     }
     
+    # Kline intervals in milliseconds
+    _INTERVAL_MS = {interval: seconds * 1000 for interval, seconds in INTERVALS.items()}
+    
+    # Binance returns at most this many klines per request
+    KLINE_PAGE_LIMIT = 1000
+    
+    # Concurrent requests used for multi-page historical fetches
+    MAX_FETCH_WORKERS = 4
+    
+    # Request weight per minute allowed by Binance, and the used weight
+    # above which requests pause until the next one-minute window
+    RATE_LIMIT_WEIGHT = 1200
+    RATE_LIMIT_THRESHOLD = 1000
+    
+    # Column layout of a /api/v3/klines row
+    KLINE_COLUMNS = [
+        "timestamp",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "close_time",
+        "quote_asset_volume",
+        "number_of_trades",
+        "taker_buy_base_asset_volume",
+        "taker_buy_quote_asset_volume",
+        "ignore"
+    ]
+    
+    # Column types applied in one bulk conversion
+    KLINE_DTYPES = {
+        "timestamp": "int64",
+        "open": "float64",
+        "high": "float64",
+        "low": "float64",
+        "close": "float64",
+        "volume": "float64",
+        "close_time": "int64",
+        "quote_asset_volume": "float64",
+        "number_of_trades": "int64",
+        "taker_buy_base_asset_volume": "float64",
+        "taker_buy_quote_asset_volume": "float64"
+    }
+    
     def __init__(self, use_testnet: bool = False, api_key: str = "", api_secret: str = ""):
         """
         Initialize the data provider.
@@ -62,6 +166,23 @@ class BinanceDataProvider:
         self.base_url = self.BASE_URL_TESTNET if use_testnet else self.BASE_URL
         self.ws_url = self.WS_URL_TESTNET if use_testnet else self.WS_URL
         
+        # Persistent HTTP session so REST calls reuse keep-alive connections
+        self._session = requests.Session()
+        self._session.headers.update({"Accept": "application/json"})
+        if api_key:
+            self._session.headers.update({"X-MBX-APIKEY": api_key})
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(500, 502, 503, 504),
+                raise_on_status=False
+            )
+        )
+        self._session.mount("https://", adapter)
+        
         # WebSocket connection
         self.ws = None
         self.ws_thread = None
@@ -75,7 +196,8 @@ class BinanceDataProvider:
         
         logger.info(f"Initialized Binance data provider (testnet: {use_testnet})")
     
-    def get_historical_data(self, symbol: str, interval: str, start_time: str, end_time: str) -> List[Dict]:
+    def get_historical_data(self, symbol: str, interval: str, start_time: str, end_time: str,
+                            as_frame: bool = False) -> Union[List[Dict], pd.DataFrame]:
         """
         Get historical kline (candlestick) data.
         
@@ -84,75 +206,184 @@ class BinanceDataProvider:
             interval: Kline interval (e.g., '1m', '1h')
             start_time: Start time in ISO format (e.g., '2023-01-01T00:00:00')
             end_time: End time in ISO format
+            as_frame: Return a columnar DataFrame instead of a list of dicts
             
         Returns:
-            List of OHLC candles
+            List of OHLC candles, or a DataFrame with one column per field if as_frame is set
         """
         # Convert ISO format to milliseconds timestamp
         start_ts = int(datetime.fromisoformat(start_time).timestamp() * 1000)
         end_ts = int(datetime.fromisoformat(end_time).timestamp() * 1000)
         
         # Calculate number of candles
-        interval_seconds = self.INTERVALS[interval]
-        total_seconds = (end_ts - start_ts) / 1000
-        num_candles = int(total_seconds / interval_seconds)
+        num_candles = (end_ts - start_ts) // self._INTERVAL_MS[interval]
         
         logger.info(f"Fetching {num_candles} historical candles for {symbol} ({interval}) from {start_time} to {end_time}")
         
         # Binance has a limit of 1000 candles per request
-        # If we need more, we need to make multiple requests
+        # If we need more, the pages are fetched concurrently
+        if num_candles <= self.KLINE_PAGE_LIMIT:
+            all_candles = self._fetch_klines_sequential(symbol, interval, start_ts, end_ts)
+        else:
+            all_candles = self._fetch_klines_parallel(symbol, interval, start_ts, end_ts)
+        
+        if all_candles is None:
+            return self._candles_to_frame([]) if as_frame else []
+        
+        logger.info(f"Fetched {len(all_candles)} historical candles for {symbol}")
+        
+        if as_frame:
+            return self._candles_to_frame(all_candles)
+        return self._candles_to_dicts(all_candles)
+    
+    def _fetch_klines_page(self, symbol: str, interval: str, start_ts: int, end_ts: int) -> Optional[List[List]]:
+        """
+        Fetch a single page of raw klines.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            interval: Kline interval (e.g., '1m', '1h')
+            start_ts: Page start time in milliseconds
+            end_ts: Page end time in milliseconds
+            
+        Returns:
+            Raw kline rows, or None if the request failed
+        """
+        endpoint = "/api/v3/klines"
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "startTime": start_ts,
+            "endTime": end_ts,
+            "limit": self.KLINE_PAGE_LIMIT
+        }
+        
+        response = self._session.get(f"{self.base_url}{endpoint}", params=params)
+        
+        if response.status_code != 200:
+            logger.error(f"Error fetching historical data: {response.text}")
+            return None
+        
+        self._respect_rate_limit(response)
+        
+        return _json_loads(response.content)
+    
+    def _respect_rate_limit(self, response: requests.Response):
+        """
+        Pause until the next rate limit window if the used weight is too high.
+        
+        Args:
+            response: Response carrying the X-MBX-USED-WEIGHT-1m header
+        """
+        used_weight = response.headers.get("X-MBX-USED-WEIGHT-1m")
+        if used_weight is None or int(used_weight) < self.RATE_LIMIT_THRESHOLD:
+            return
+        
+        # Binance resets the weight counter at each minute boundary
+        wait = 60.0 - (time.time() % 60.0)
+        logger.warning("Used weight %s/%d, pausing %.1fs", used_weight, self.RATE_LIMIT_WEIGHT, wait)
+        time.sleep(wait)
+    
+    def _fetch_klines_sequential(self, symbol: str, interval: str, start_ts: int, end_ts: int) -> Optional[List[List]]:
+        """
+        Fetch raw klines page by page, following the last returned candle.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            interval: Kline interval (e.g., '1m', '1h')
+            start_ts: Start time in milliseconds
+            end_ts: End time in milliseconds
+            
+        Returns:
+            Raw kline rows, or None if a request failed
+        """
         all_candles = []
         current_start = start_ts
         
         while current_start < end_ts:
-            # Make API request
-            endpoint = "/api/v3/klines"
-            params = {
-                "symbol": symbol,
-                "interval": interval,
-                "startTime": current_start,
-                "endTime": end_ts,
-                "limit": 1000
-            }
-            
-            response = requests.get(f"{self.base_url}{endpoint}", params=params)
+            candles = self._fetch_klines_page(symbol, interval, current_start, end_ts)
             
-            if response.status_code != 200:
-                logger.error(f"Error fetching historical data: {response.text}")
-                return []
-            
-            # Parse response
-            candles = response.json()
+            if candles is None:
+                return None
             
             if not candles:
                 break
             
-            # Convert to OHLC format
-            ohlc_candles = [{
-                "timestamp": candle[0],
-                "open": float(candle[1]),
-                "high": float(candle[2]),
-                "low": float(candle[3]),
-                "close": float(candle[4]),
-                "volume": float(candle[5]),
-                "close_time": candle[6],
-                "quote_asset_volume": float(candle[7]),
-                "number_of_trades": int(candle[8]),
-                "taker_buy_base_asset_volume": float(candle[9]),
-                "taker_buy_quote_asset_volume": float(candle[10])
-            } for candle in candles]
-            
-            all_candles.extend(ohlc_candles)
+            # Keep raw rows; they are converted once after the last page
+            all_candles.extend(candles)
             
             # Update start time for next request
             current_start = candles[-1][0] + 1
-            
-            # Add a small delay to avoid API rate limits
-            time.sleep(0.5)
         
-        logger.info(f"Fetched {len(all_candles)} historical candles for {symbol}")
         return all_candles
     
+    def _fetch_klines_parallel(self, symbol: str, interval: str, start_ts: int, end_ts: int) -> Optional[List[List]]:
+        """
+        Fetch raw klines with one concurrent request per precomputed page.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            interval: Kline interval (e.g., '1m', '1h')
+            start_ts: Start time in milliseconds
+            end_ts: End time in milliseconds
+            
+        Returns:
+            Raw kline rows ordered by open time, or None if a request failed
+        """
+        page_ms = self.KLINE_PAGE_LIMIT * self._INTERVAL_MS[interval]
+        
+        def fetch_page(page_start: int) -> Optional[List[List]]:
+            return self._fetch_klines_page(symbol, interval, page_start, min(page_start + page_ms - 1, end_ts))
+        
+        # The worker count bounds how much request weight is in flight at once
+        with ThreadPoolExecutor(max_workers=self.MAX_FETCH_WORKERS) as executor:
+            pages = list(executor.map(fetch_page, range(start_ts, end_ts, page_ms)))
+        
+        if any(page is None for page in pages):
+            return None
+        
+        # Pages cover disjoint, increasing time ranges and map() keeps their order
+        return [candle for page in pages for candle in page]
+    
+    @classmethod
+    def _candles_to_frame(cls, candles: List[List]) -> pd.DataFrame:
+        """
+        Convert raw kline rows into a columnar DataFrame.
+        
+        Args:
+            candles: Raw rows from /api/v3/klines
+            
+        Returns:
+            DataFrame with one typed column per kline field
+        """
+        frame = pd.DataFrame(candles, columns=cls.KLINE_COLUMNS)
+        return frame.drop(columns="ignore").astype(cls.KLINE_DTYPES)
+    
+    @staticmethod
+    def _candles_to_dicts(candles: List[List]) -> List[Dict]:
+        """
+        Convert raw kline rows into a list of OHLC dicts.
+        
+        Args:
+            candles: Raw rows from /api/v3/klines
+            
+        Returns:
+            List of OHLC candles
+        """
+        return [{
+            "timestamp": candle[0],
+            "open": float(candle[1]),
+            "high": float(candle[2]),
+            "low": float(candle[3]),
+            "close": float(candle[4]),
+            "volume": float(candle[5]),
+            "close_time": candle[6],
+            "quote_asset_volume": float(candle[7]),
+            "number_of_trades": int(candle[8]),
+            "taker_buy_base_asset_volume": float(candle[9]),
+            "taker_buy_quote_asset_volume": float(candle[10])
+        } for candle in candles]
+    
     def get_current_price(self, symbol: str) -> float:
         """
         Get current price for a symbol.
@@ -166,13 +397,13 @@ class BinanceDataProvider:
         endpoint = "/api/v3/ticker/price"
         params = {"symbol": symbol}
         
-        response = requests.get(f"{self.base_url}{endpoint}", params=params)
+        response = self._session.get(f"{self.base_url}{endpoint}", params=params)
         
         if response.status_code != 200:
             logger.error(f"Error fetching current price: {response.text}")
             return 0.0
         
-        data = response.json()
+        data = _json_loads(response.content)
         return float(data["price"])
     
     def get_order_book(self, symbol: str, limit: int = 100) -> Dict:
@@ -184,29 +415,41 @@ class BinanceDataProvider:
             limit: Number of bids and asks to return
             
         Returns:
-            Order book with bids and asks
+            Order book with 'bids' and 'asks' float64 arrays of (price, quantity) rows
         """
         endpoint = "/api/v3/depth"
         params = {"symbol": symbol, "limit": limit}
         
-        response = requests.get(f"{self.base_url}{endpoint}", params=params)
+        response = self._session.get(f"{self.base_url}{endpoint}", params=params)
         
         if response.status_code != 200:
             logger.error(f"Error fetching order book: {response.text}")
-            return {"bids": [], "asks": []}
+            return {"bids": self._depth_levels([]), "asks": self._depth_levels([])}
         
-        data = response.json()
+        data = _json_loads(response.content)
         
-        # Convert strings to floats
-        bids = [[float(price), float(qty)] for price, qty in data["bids"]]
-        asks = [[float(price), float(qty)] for price, qty in data["asks"]]
+        return {"bids": self._depth_levels(data["bids"]), "asks": self._depth_levels(data["asks"])}
+    
+    @staticmethod
+    def _depth_levels(levels: List[List[str]]) -> np.ndarray:
+        """
+        Convert order book levels into a numeric array.
         
-        return {"bids": bids, "asks": asks}
+        Args:
+            levels: [price, quantity] pairs as returned by Binance (strings)
+            
+        Returns:
+            float64 array of shape (len(levels), 2)
+        """
+        # NumPy parses the numeric strings in a single C-level conversion
+        return np.asarray(levels, dtype=np.float64).reshape(-1, 2)
     
     def connect_websocket(self, symbol: str, callbacks: Dict = None):
         """
         Connect to Binance WebSocket for real-time data.
         
+        Only streams with a registered callback are subscribed to.
+        
         Args:
             symbol: Trading pair symbol (e.g., 'BTCUSDT')
             callbacks: Dictionary of callback functions for different stream types
@@ -217,17 +460,24 @@ class BinanceDataProvider:
             self.on_depth_callback = callbacks.get("depth")
         
         # Create WebSocket connection
-        streams = [
-            f"{symbol.lower()}@kline_1m",
-            f"{symbol.lower()}@trade",
-            f"{symbol.lower()}@depth20@100ms"
-        ]
-        
-        stream_url = f"{self.ws_url}/stream?streams={'/'.join(streams)}"
+        sym = symbol.lower()
+        streams = []
+        if self.on_kline_callback is not None:
+            streams.append(f"{sym}@kline_1m")
+        if self.on_trade_callback is not None:
+            streams.append(f"{sym}@trade")
+        if self.on_depth_callback is not None:
+            streams.append(f"{sym}@depth20@100ms")
         
         # Close existing connection if any
         self.disconnect_websocket()
         
+        if not streams:
+            logger.warning("No WebSocket callbacks registered for %s, not connecting", symbol)
+            return
+        
+        stream_url = f"{self.ws_url}/stream?streams={'/'.join(streams)}"
+        
         # Create new connection
         self.ws = websocket.WebSocketApp(
             stream_url,
@@ -237,8 +487,12 @@ class BinanceDataProvider:
             on_open=self._on_open
         )
         
-        # Start WebSocket in a separate thread
-        self.ws_thread = Thread(target=self.ws.run_forever)
+        # Start WebSocket in a separate thread; disable Nagle so small
+        # frames are not held back waiting to be coalesced
+        self.ws_thread = Thread(
+            target=self.ws.run_forever,
+            kwargs={"sockopt": ((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),)}
+        )
         self.ws_thread.daemon = True
         self.ws_thread.start()
         
@@ -268,7 +522,40 @@ class BinanceDataProvider:
         WebSocket message received.
         """
         try:
-            data = json.loads(message)
+            # Peek at the stream name in the raw frame so frames nobody
+            # subscribed to are dropped before the body is parsed
+            match = _STREAM_NAME_RE.search(message)
+            if match:
+                stream = match.group(1)
+                if not self._has_stream_callback(stream):
+                    return
+                
+                # With msgspec, kline and trade frames decode straight into typed structs
+                if _KLINE_DECODER is not None:
+                    if "kline" in stream:
+                        kline = _KLINE_DECODER.decode(message).data.k
+                        self.on_kline_callback({
+                            "timestamp": kline.t,
+                            "open": kline.o,
+                            "high": kline.h,
+                            "low": kline.l,
+                            "close": kline.c,
+                            "volume": kline.v,
+                            "close_time": kline.T,
+                            "is_closed": kline.x
+                        })
+                        return
+                    if "trade" in stream:
+                        trade = _TRADE_DECODER.decode(message).data
+                        self.on_trade_callback({
+                            "timestamp": trade.T,
+                            "price": trade.p,
+                            "quantity": trade.q,
+                            "is_buyer_maker": trade.m
+                        })
+                        return
+            
+            data = _json_loads(message)
             
             # Extract stream name and data
             stream = data.get("stream", "")
@@ -300,19 +587,37 @@ class BinanceDataProvider:
             
             elif "depth" in stream and self.on_depth_callback:
                 depth = {
-                    "bids": [[float(p), float(q)] for p, q in stream_data.get("bids", [])],
-                    "asks": [[float(p), float(q)] for p, q in stream_data.get("asks", [])]
+                    "bids": self._depth_levels(stream_data.get("bids", [])),
+                    "asks": self._depth_levels(stream_data.get("asks", []))
                 }
                 self.on_depth_callback(depth)
         
         except Exception as e:
-            logger.error(f"Error processing WebSocket message: {str(e)}")
+            logger.error("Error processing WebSocket message: %s", e)
+    
+    def _has_stream_callback(self, stream: str) -> bool:
+        """
+        Check whether a callback is registered for a stream.
+        
+        Args:
+            stream: Combined-stream name (e.g., 'btcusdt@trade')
+            
+        Returns:
+            True if a frame from this stream would be dispatched
+        """
+        if "kline" in stream:
+            return self.on_kline_callback is not None
+        if "trade" in stream:
+            return self.on_trade_callback is not None
+        if "depth" in stream:
+            return self.on_depth_callback is not None
+        return False
     
     def _on_error(self, ws, error):
         """
         WebSocket error occurred.
         """
-        logger.error(f"WebSocket error: {str(error)}")
+        logger.error("WebSocket error: %s", error)
     
     def _on_close(self, ws, close_status_code, close_msg):
         """
@@ -320,4 +625,4 @@ class BinanceDataProvider:
         """
         with self.ws_lock:
             self.ws_connected = False
-        logger.info(f"WebSocket connection closed: {close_status_code} {close_msg}")
+        logger.info("WebSocket connection closed: %s %s", close_status_code, close_msg)
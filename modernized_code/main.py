@@ -9,11 +9,9 @@ for cryptocurrency trading with automated strategies on Binance.
 import sys
 import logging
 from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QSplitter, QWidget, QVBoxLayout
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 
 from ui.fake_account_tab import FakeAccountTab
-from ui.binance_account_tab import BinanceAccountTab
-from ui.history_tab import HistoryTab
 from ui.logger_widget import LoggerWidget
 from config import load_config
 
@@ -44,15 +42,13 @@ class TraderBotApp(QMainWindow):
         # Create tab widget for main content
         self.tabs = QTabWidget()
         
-        # Create tabs
+        # Create the default tab; the others are created after the first paint
         self.fake_account_tab = FakeAccountTab(self.config)
-        self.binance_account_tab = BinanceAccountTab(self.config)
-        self.history_tab = HistoryTab(self.config)
+        self.binance_account_tab = None
+        self.history_tab = None
         
         # Add tabs to widget
         self.tabs.addTab(self.fake_account_tab, "Fake Account Test")
-        self.tabs.addTab(self.binance_account_tab, "Binance Account")
-        self.tabs.addTab(self.history_tab, "History Test")
         
         # Create logger widget
         self.logger_widget = LoggerWidget()
@@ -67,16 +63,31 @@ class TraderBotApp(QMainWindow):
         # Set central widget
         self.setCentralWidget(self.main_splitter)
         
+        # Build the remaining tabs once the event loop is running
+        QTimer.singleShot(0, self._create_deferred_tabs)
+        
         logger.info("Trader Bot application initialized")
     
+    def _create_deferred_tabs(self):
+        """Create the tabs that are not shown on startup."""
+        # Imported here so their modules load after the window is painted
+        from ui.binance_account_tab import BinanceAccountTab
+        from ui.history_tab import HistoryTab
+        
+        self.binance_account_tab = BinanceAccountTab(self.config)
+        self.history_tab = HistoryTab(self.config)
+        
+        self.tabs.addTab(self.binance_account_tab, "Binance Account")
+        self.tabs.addTab(self.history_tab, "History Test")
+    
     def closeEvent(self, event):
         """Handle application close event."""
         logger.info("Shutting down Trader Bot application")
         
-        # Clean up resources
-        self.fake_account_tab.cleanup()
-        self.binance_account_tab.cleanup()
-        self.history_tab.cleanup()
+        # Clean up resources (deferred tabs may not have been created yet)
+        for tab in (self.fake_account_tab, self.binance_account_tab, self.history_tab):
+            if tab is not None:
+                tab.cleanup()
         
         event.accept()
 
@@ -1,28 +1,52 @@
 #!/usr/bin/env python3
 """
 Trading strategies package.
+
+Strategy modules are imported on first use, so only the selected strategy
+(and its NumPy/Numba dependencies) is loaded.
 """
 
-from .moving_average_crossover import MovingAverageCrossover
-from .rsi_strategy import RSIStrategy
-from .macd_strategy import MACDStrategy
+import importlib
 
-# Dictionary of available strategies
-AVAILABLE_STRATEGIES = {
-    "Moving Average Crossover": MovingAverageCrossover,
-    "RSI Strategy": RSIStrategy,
-    "MACD Strategy": MACDStrategy
+# Strategy names mapped to the module and class implementing them
+_STRATEGY_CLASSES = {
+    "Moving Average Crossover": (".moving_average_crossover", "MovingAverageCrossover"),
+    "RSI Strategy": (".rsi_strategy", "RSIStrategy"),
+    "MACD Strategy": (".macd_strategy", "MACDStrategy")
 }
 
 
+def _load_strategy_class(strategy_name):
+    """Import and return the class implementing a strategy."""
+    module_name, class_name = _STRATEGY_CLASSES[strategy_name]
+    strategy_class = getattr(importlib.import_module(module_name, __name__), class_name)
+    globals()[class_name] = strategy_class
+    return strategy_class
+
+
+def __getattr__(name):
+    """Resolve strategy classes and AVAILABLE_STRATEGIES on first access."""
+    if name == "AVAILABLE_STRATEGIES":
+        # Dictionary of available strategies, built once and then found in globals()
+        available = {strategy_name: _load_strategy_class(strategy_name) for strategy_name in _STRATEGY_CLASSES}
+        globals()["AVAILABLE_STRATEGIES"] = available
+        return available
+    
+    for strategy_name, (_, class_name) in _STRATEGY_CLASSES.items():
+        if class_name == name:
+            return _load_strategy_class(strategy_name)
+    
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_strategy_names():
     """Get list of available strategy names."""
-    return list(AVAILABLE_STRATEGIES.keys())
+    return list(_STRATEGY_CLASSES.keys())
 
 
 def create_strategy(strategy_name, **kwargs):
     """Create a strategy instance by name."""
-    if strategy_name in AVAILABLE_STRATEGIES:
-        return AVAILABLE_STRATEGIES[strategy_name](**kwargs)
+    if strategy_name in _STRATEGY_CLASSES:
+        return _load_strategy_class(strategy_name)(**kwargs)
     else:
         raise ValueError(f"Unknown strategy: {strategy_name}")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Numeric kernels shared by the trading strategies.
+
+The kernels are compiled with Numba when it is installed; otherwise they run
+as plain Python functions over NumPy arrays.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    def njit(*args, **kwargs):
+        """Fallback decorator used when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def ema_recurrence(arr: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """
+    Calculate an Exponential Moving Average seeded with a simple average.
+    
+    Args:
+        arr: Contiguous float64 input series
+        period: EMA period
+        alpha: Smoothing factor, usually 2 / (period + 1)
+        
+    Returns:
+        Array of len(arr) - period + 1 EMA values
+    """
+    n = arr.shape[0] - period + 1
+    out = np.empty(n, dtype=np.float64)
+    out[0] = arr[:period].mean()
+    one_minus_alpha = 1.0 - alpha
+    for i in range(1, n):
+        out[i] = arr[i + period - 1] * alpha + out[i - 1] * one_minus_alpha
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def macd_lines(prices: np.ndarray, fast_period: int, slow_period: int, signal_period: int,
+               alpha_fast: float, alpha_slow: float, alpha_signal: float):
+    """
+    Calculate the MACD and signal lines over a price series.
+    
+    Args:
+        prices: Contiguous float64 price series
+        fast_period: Period for the fast EMA
+        slow_period: Period for the slow EMA
+        signal_period: Period for the signal line
+        alpha_fast: Smoothing factor of the fast EMA
+        alpha_slow: Smoothing factor of the slow EMA
+        alpha_signal: Smoothing factor of the signal line
+        
+    Returns:
+        Tuple of (last fast EMA, last slow EMA, MACD line, signal line); the
+        MACD line is aligned with the signal line and both are empty when
+        there are not enough prices
+    """
+    empty = np.empty(0, dtype=np.float64)
+    if prices.shape[0] < max(fast_period, slow_period):
+        return 0.0, 0.0, empty, empty
+    
+    fast_ema = ema_recurrence(prices, fast_period, alpha_fast)
+    slow_ema = ema_recurrence(prices, slow_period, alpha_slow)
+    macd_line = fast_ema[-slow_ema.shape[0]:] - slow_ema
+    
+    if macd_line.shape[0] < signal_period:
+        return fast_ema[-1], slow_ema[-1], empty, empty
+    
+    signal_line = ema_recurrence(macd_line, signal_period, alpha_signal)
+    return fast_ema[-1], slow_ema[-1], macd_line[-signal_line.shape[0]:], signal_line
+
+
+@njit(cache=True, fastmath=True)
+def macd_12_26_9(prices: np.ndarray):
+    """
+    MACD specialized for the default (12, 26, 9) periods.
+    
+    The periods and smoothing factors are compile-time constants, which lets
+    Numba fold them into the EMA loops.
+    
+    Args:
+        prices: Contiguous float64 price series
+        
+    Returns:
+        Same tuple as macd_lines
+    """
+    return macd_lines(prices, 12, 26, 9, 2.0 / 13.0, 2.0 / 27.0, 2.0 / 10.0)
+
+
+@njit(cache=True)
+def crossover(prev_fast: float, cur_fast: float, prev_slow: float, cur_slow: float):
+    """
+    Detect whether a line crossed another one between two bars.
+    
+    Args:
+        prev_fast: Previous value of the crossing line
+        cur_fast: Current value of the crossing line
+        prev_slow: Previous value of the reference line
+        cur_slow: Current value of the reference line
+        
+    Returns:
+        Tuple of (direction, spread): direction is +1 when the line crossed
+        above the reference, -1 when it crossed below and 0 otherwise;
+        spread is cur_fast - cur_slow
+    """
+    diff_prev = prev_fast - prev_slow
+    diff_cur = cur_fast - cur_slow
+    
+    # +1 when above the reference, -1 when below, 0 when equal
+    direction = int(diff_cur > 0) - int(diff_cur < 0)
+    
+    # A crossover ends on a non-zero side that the previous bar was not on
+    if direction * diff_prev > 0:
+        direction = 0
+    return direction, diff_cur
+
+
+@njit(cache=True)
+def rsi_value(avg_gain: float, avg_loss: float) -> float:
+    """
+    Convert an average gain and loss into an RSI value.
+    
+    Args:
+        avg_gain: Smoothed average gain
+        avg_loss: Smoothed average loss
+        
+    Returns:
+        RSI value between 0 and 100
+    """
+    if avg_loss == 0.0:
+        # Only gains is fully overbought, a flat market is neutral
+        return 100.0 if avg_gain > 0.0 else 50.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True, fastmath=True)
+def wilder_rsi(prices: np.ndarray, period: int, out_rsi: np.ndarray):
+    """
+    Calculate RSI with Wilder smoothing over a price series.
+    
+    Price changes are split into gains and losses inline, in the same pass
+    as the smoothing, so no intermediate arrays are allocated.
+    
+    Args:
+        prices: Contiguous float64 price series, longer than period
+        period: RSI period
+        out_rsi: Output array of len(prices) - period RSI values
+        
+    Returns:
+        Tuple of the last (average gain, average loss)
+    """
+    # Loop invariants of the smoothing formula
+    inv_period = 1.0 / period
+    period_minus_one = period - 1
+    
+    # First average is simple average
+    gain_sum = 0.0
+    loss_sum = 0.0
+    for i in range(1, period + 1):
+        delta = prices[i] - prices[i - 1]
+        gain_sum += max(delta, 0.0)
+        loss_sum += max(-delta, 0.0)
+    avg_gain = gain_sum * inv_period
+    avg_loss = loss_sum * inv_period
+    out_rsi[0] = rsi_value(avg_gain, avg_loss)
+    
+    # Subsequent averages use smoothing formula
+    for i in range(period + 1, prices.shape[0]):
+        delta = prices[i] - prices[i - 1]
+        avg_gain = (avg_gain * period_minus_one + max(delta, 0.0)) * inv_period
+        avg_loss = (avg_loss * period_minus_one + max(-delta, 0.0)) * inv_period
+        out_rsi[i - period] = rsi_value(avg_gain, avg_loss)
+    return avg_gain, avg_loss
@@ -8,17 +8,27 @@ and sell signals when it crosses below.
 
 import time
 import logging
+from collections import deque
+from functools import partial
 import numpy as np
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
-from strategy_interface import TradeStrategyInterface, TradeSignal
+from strategy_interface import TradeStrategyInterface, TradeSignal, close_prices
+from .kernels import crossover, macd_lines, macd_12_26_9
 
 logger = logging.getLogger(__name__)
 
+# Signal types, bound once for the signal paths
+_BUY = TradeSignal.BUY
+_SELL = TradeSignal.SELL
+
 
 class MACDStrategy(TradeStrategyInterface):
     """MACD (Moving Average Convergence Divergence) Strategy."""
     
+    # Number of MACD/signal/histogram values kept for crossover detection
+    HISTORY_SIZE = 3
+    
     def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
         """
         Initialize the strategy.
@@ -36,22 +46,23 @@ class MACDStrategy(TradeStrategyInterface):
             "signal_period": signal_period
         }
         
-        # Initialize data storage
-        self.prices = []
-        self.macd_line = []
-        self.signal_line = []
-        self.histogram = []
+        # Initialize data storage (bounded by _apply_parameters)
+        self.prices = deque()
+        self._clear_macd_state()
         self.last_crossover = None  # 'bullish' or 'bearish'
         
+        self._apply_parameters()
+        
         logger.info(f"Initialized MACD strategy with fast_period={fast_period}, slow_period={slow_period}, signal_period={signal_period}")
     
-    def execute(self, current_price: float, in_position: bool) -> Optional[TradeSignal]:
+    def execute(self, current_price: float, in_position: bool, timestamp: Optional[int] = None) -> Optional[TradeSignal]:
         """
         Execute the strategy and generate a trading signal.
         
         Args:
             current_price: Current price of the asset
             in_position: Whether we currently hold a position
+            timestamp: Unix timestamp of the market data being acted on; defaults to the current time
             
         Returns:
             A TradeSignal object or None if no action should be taken
@@ -60,53 +71,95 @@ class MACDStrategy(TradeStrategyInterface):
         if len(self.macd_line) < 2 or len(self.signal_line) < 2:
             return None
         
-        # Check for crossover
-        current_macd = self.macd_line[-1]
-        current_signal = self.signal_line[-1]
-        previous_macd = self.macd_line[-2]
-        previous_signal = self.signal_line[-2]
-        
-        # Bullish crossover (MACD crosses above signal)
-        if previous_macd <= previous_signal and current_macd > current_signal:
-            if not in_position:
-                logger.info(f"Bullish MACD crossover detected at price {current_price}")
-                self.last_crossover = 'bullish'
-                # Calculate confidence based on histogram strength
-                confidence = min(abs(self.histogram[-1]) / 0.5, 1.0)  # Normalize to 0-1 range
-                return TradeSignal(TradeSignal.BUY, current_price, int(time.time()), confidence)
-        
-        # Bearish crossover (MACD crosses below signal)
-        elif previous_macd >= previous_signal and current_macd < current_signal:
-            if in_position:
-                logger.info(f"Bearish MACD crossover detected at price {current_price}")
-                self.last_crossover = 'bearish'
-                # Calculate confidence based on histogram strength
-                confidence = min(abs(self.histogram[-1]) / 0.5, 1.0)  # Normalize to 0-1 range
-                return TradeSignal(TradeSignal.SELL, current_price, int(time.time()), confidence)
-        
-        return None
+        # Check for crossover as a sign change of (MACD - signal)
+        direction, histogram = crossover(
+            self.macd_line[-2], self.macd_line[-1], self.signal_line[-2], self.signal_line[-1]
+        )
+        
+        # Bullish crossovers only open a position, bearish ones only close it
+        if not direction or (direction > 0) == in_position:
+            return None
+        
+        # Calculate confidence based on histogram strength
+        confidence = min(abs(histogram) / 0.5, 1.0)  # Normalize to 0-1 range
+        
+        if direction > 0:
+            logger.info("Bullish MACD crossover detected at price %s", current_price)
+            self.last_crossover = 'bullish'
+            return TradeSignal(_BUY, current_price, int(time.time()) if timestamp is None else timestamp, confidence)
+        
+        logger.info("Bearish MACD crossover detected at price %s", current_price)
+        self.last_crossover = 'bearish'
+        return TradeSignal(_SELL, current_price, int(time.time()) if timestamp is None else timestamp, confidence)
+    
+    def backtest(self, closes: np.ndarray, in_position_mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate the signals for a whole close price history in one pass.
+        
+        The strategy state is left untouched.
+        
+        Args:
+            closes: Close prices, oldest first
+            in_position_mask: Optional boolean array aligned with closes telling
+                whether a position is held at each bar; when given, buy signals
+                are dropped while in position and sell signals while out of it,
+                as execute() does
+                
+        Returns:
+            Tuple of (signals, confidence) aligned with closes: signals is an
+            int8 array of +1 (buy), -1 (sell) or 0, and confidence holds the
+            signal confidence at bars with a signal and 0 elsewhere
+        """
+        closes = np.ascontiguousarray(closes, dtype=np.float64)
+        signals = np.zeros(len(closes), dtype=np.int8)
+        confidence = np.zeros(len(closes), dtype=np.float64)
+        
+        _, _, macd_line, signal_line = self._macd_lines(closes)
+        if len(signal_line) < 2:
+            return signals, confidence
+        
+        # Histogram values and the index of the first bar they cover
+        diff = macd_line - signal_line
+        offset = len(closes) - len(diff)
+        
+        # Crossovers end on the bar after the sign change
+        cross_up = (diff[:-1] <= 0) & (diff[1:] > 0)
+        cross_down = (diff[:-1] >= 0) & (diff[1:] < 0)
+        bar_signals = cross_up.view(np.int8) - cross_down.view(np.int8)
+        
+        if in_position_mask is not None:
+            in_position = np.asarray(in_position_mask, dtype=bool)[offset + 1:]
+            bar_signals[in_position & cross_up] = 0
+            bar_signals[~in_position & cross_down] = 0
+        
+        signals[offset + 1:] = bar_signals
+        confidence[offset + 1:] = np.where(bar_signals != 0, np.minimum(np.abs(diff[1:]) / 0.5, 1.0), 0.0)
+        
+        return signals, confidence
     
     def feed_ohlc(self, ohlc_data: List[Dict[str, Union[float, int]]]):
         """
         Feed OHLC data to the strategy and update MACD.
         
         Args:
-            ohlc_data: List of OHLC candles
+            ohlc_data: List of OHLC candles or a columnar frame with a 'close' column
         """
         # Extract close prices
-        self.prices = [candle['close'] for candle in ohlc_data]
+        closes = close_prices(ohlc_data)
+        self.prices = deque(closes.tolist(), maxlen=self._max_period)
         
-        # Calculate MACD
-        self._calculate_macd()
+        # Calculate MACD and seed the incremental state
+        self._clear_macd_state()
+        self._calculate_macd(closes)
         
-        logger.debug(f"Fed {len(ohlc_data)} OHLC candles to MACD strategy")
+        logger.debug("Fed %d OHLC candles to MACD strategy", len(ohlc_data))
     
-    def feed_depth(self, depth_data: Dict[str, List[List[float]]]):
+    def feed_depth(self, depth_data: Dict[str, np.ndarray]):
         """
         Feed market depth data to the strategy.
         
         Args:
-            depth_data: Market depth data with 'bids' and 'asks' lists
+            depth_data: Market depth data with 'bids' and 'asks' arrays of (price, quantity) rows
         """
         # This strategy doesn't use depth data
         pass
@@ -120,85 +173,120 @@ class MACDStrategy(TradeStrategyInterface):
             quantity: Last trade quantity
             volume: Current volume
         """
-        # Add price to prices list
+        # Add price to the bounded buffer; the oldest price is evicted when full
         self.prices.append(price)
         
-        # Keep only the necessary number of prices
-        max_period = max(self.parameters["fast_period"], self.parameters["slow_period"]) * 3
-        if len(self.prices) > max_period:  # Keep some extra for calculation
-            self.prices = self.prices[-max_period:]
+        # Until the EMAs are seeded, recalculate MACD from the price buffer
+        if self._signal_last is None:
+            self._calculate_macd()
+            return
         
-        # Recalculate MACD
-        self._calculate_macd()
+        # Afterwards, only the newest value of each EMA needs updating
+        self._update_macd(price)
     
-    def _calculate_macd(self):
+    def _update_macd(self, price: float):
         """
-        Calculate MACD from prices.
+        Advance the MACD state by one price using the EMA recurrence.
+        
+        The EMAs carry over the full price history rather than being re-seeded
+        from the trimmed price buffer on every tick, so live values and signals
+        can differ from a full recalculation over the buffer.
+        
+        Args:
+            price: Newest price
         """
-        fast_period = self.parameters["fast_period"]
-        slow_period = self.parameters["slow_period"]
-        signal_period = self.parameters["signal_period"]
+        self._fast_ema_last = price * self._alpha_fast + self._fast_ema_last * self._one_minus_alpha_fast
+        self._slow_ema_last = price * self._alpha_slow + self._slow_ema_last * self._one_minus_alpha_slow
+        macd = self._fast_ema_last - self._slow_ema_last
+        self._signal_last = macd * self._alpha_signal + self._signal_last * self._one_minus_alpha_signal
+        
+        self.macd_line.append(macd)
+        self.signal_line.append(self._signal_last)
+        self.histogram.append(macd - self._signal_last)
+    
+    def _calculate_macd(self, prices: Optional[np.ndarray] = None):
+        """
+        Calculate MACD from prices and seed the incremental EMA state.
         
+        Args:
+            prices: Price array to use instead of converting the price buffer
+        """
         # Need enough prices to calculate both EMAs
-        if len(self.prices) <= slow_period:
+        if len(self.prices) <= self._slow_period:
             return
         
-        # Calculate fast EMA
-        fast_ema = self._calculate_ema(self.prices, fast_period)
+        if prices is None:
+            prices = np.fromiter(self.prices, dtype=np.float64, count=len(self.prices))
         
-        # Calculate slow EMA
-        slow_ema = self._calculate_ema(self.prices, slow_period)
+        # Calculate the MACD line (fast EMA - slow EMA) and its signal line
+        fast_last, slow_last, macd_line, signal_line = self._macd_lines(np.ascontiguousarray(prices))
         
-        # Calculate MACD line (fast EMA - slow EMA)
-        # Align the arrays since they have different lengths
-        macd_line = [fast - slow for fast, slow in zip(fast_ema[-len(slow_ema):], slow_ema)]
-        
-        # Calculate signal line (EMA of MACD line)
-        if len(macd_line) >= signal_period:
-            signal_line = self._calculate_ema(macd_line, signal_period)
-            
+        if len(signal_line):
             # Calculate histogram (MACD line - signal line)
-            # Align the arrays
-            histogram = [macd - signal for macd, signal in zip(macd_line[-len(signal_line):], signal_line)]
+            histogram = macd_line - signal_line
+            
+            # execute() only looks at the last two values
+            self.macd_line = deque(macd_line[-self.HISTORY_SIZE:].tolist(), maxlen=self.HISTORY_SIZE)
+            self.signal_line = deque(signal_line[-self.HISTORY_SIZE:].tolist(), maxlen=self.HISTORY_SIZE)
+            self.histogram = deque(histogram[-self.HISTORY_SIZE:].tolist(), maxlen=self.HISTORY_SIZE)
             
-            self.macd_line = macd_line[-len(signal_line):]
-            self.signal_line = signal_line
-            self.histogram = histogram
+            self._fast_ema_last = float(fast_last)
+            self._slow_ema_last = float(slow_last)
+            self._signal_last = float(signal_line[-1])
     
-    @staticmethod
-    def _calculate_ema(data: List[float], period: int) -> List[float]:
+    def _apply_parameters(self):
         """
-        Calculate Exponential Moving Average.
-        
-        Args:
-            data: List of price data
-            period: EMA period
-            
-        Returns:
-            List of EMA values
+        Precompute the EMA smoothing factors and the price buffer size.
         """
-        if len(data) < period:
-            return []
-        
-        # Calculate multiplier
-        multiplier = 2 / (period + 1)
+        fast_period = self.parameters["fast_period"]
+        slow_period = self.parameters["slow_period"]
+        signal_period = self.parameters["signal_period"]
         
-        # Calculate first EMA as SMA
-        ema = [sum(data[:period]) / period]
+        self._alpha_fast = 2.0 / (fast_period + 1)
+        self._alpha_slow = 2.0 / (slow_period + 1)
+        self._alpha_signal = 2.0 / (signal_period + 1)
+        self._one_minus_alpha_fast = 1.0 - self._alpha_fast
+        self._one_minus_alpha_slow = 1.0 - self._alpha_slow
+        self._one_minus_alpha_signal = 1.0 - self._alpha_signal
+        self._slow_period = slow_period
+        self._max_period = max(fast_period, slow_period) * 3  # Keep some extra for calculation
         
-        # Calculate subsequent EMAs
-        for i in range(period, len(data)):
-            ema.append((data[i] - ema[-1]) * multiplier + ema[-1])
+        # Use the kernel specialized for the default periods when they match
+        if (fast_period, slow_period, signal_period) == (12, 26, 9):
+            self._macd_lines = macd_12_26_9
+        else:
+            self._macd_lines = partial(
+                macd_lines,
+                fast_period=fast_period,
+                slow_period=slow_period,
+                signal_period=signal_period,
+                alpha_fast=self._alpha_fast,
+                alpha_slow=self._alpha_slow,
+                alpha_signal=self._alpha_signal
+            )
+        self.prices = deque(self.prices, maxlen=self._max_period)
         
-        return ema
+        # The incremental state was built with the old periods; reseed it
+        if self._signal_last is not None:
+            self._clear_macd_state()
+            self._calculate_macd()
+    
+    def _clear_macd_state(self):
+        """
+        Clear the MACD output buffers and the incremental EMA state.
+        """
+        self.macd_line = deque(maxlen=self.HISTORY_SIZE)
+        self.signal_line = deque(maxlen=self.HISTORY_SIZE)
+        self.histogram = deque(maxlen=self.HISTORY_SIZE)
+        self._fast_ema_last = None
+        self._slow_ema_last = None
+        self._signal_last = None
     
     def reset(self):
         """
         Reset the strategy state.
         """
         super().reset()
-        self.prices = []
-        self.macd_line = []
-        self.signal_line = []
-        self.histogram = []
+        self.prices.clear()
+        self._clear_macd_state()
         self.last_crossover = None
@@ -8,47 +8,64 @@ a slow moving average, and sell signals when it crosses below.
 
 import time
 import logging
+from collections import deque
 import numpy as np
 from typing import Dict, List, Optional, Union
 
-from strategy_interface import TradeStrategyInterface, TradeSignal
+from strategy_interface import TradeStrategyInterface, TradeSignal, close_prices
+from .kernels import crossover, ema_recurrence
 
 logger = logging.getLogger(__name__)
 
+# Signal types, bound once for the signal paths
+_BUY = TradeSignal.BUY
+_SELL = TradeSignal.SELL
+
 
 class MovingAverageCrossover(TradeStrategyInterface):
     """Moving Average Crossover Strategy."""
     
-    def __init__(self, fast_period: int = 9, slow_period: int = 20):
+    # Supported moving average types
+    MA_TYPES = ("sma", "ema")
+    
+    # Number of fast/slow MA values kept for crossover detection
+    HISTORY_SIZE = 4
+    
+    def __init__(self, fast_period: int = 9, slow_period: int = 20, ma_type: str = "sma"):
         """
         Initialize the strategy.
         
         Args:
             fast_period: Period for the fast moving average
             slow_period: Period for the slow moving average
+            ma_type: Moving average type, "sma" (simple) or "ema" (exponential)
         """
         super().__init__(name="Moving Average Crossover")
+        self._check_ma_type(ma_type)
         
         self.parameters = {
             "fast_period": fast_period,
-            "slow_period": slow_period
+            "slow_period": slow_period,
+            "ma_type": ma_type
         }
         
-        # Initialize data storage
-        self.prices = []
-        self.fast_ma = []
-        self.slow_ma = []
+        # Initialize data storage (bounded by _apply_parameters)
+        self.prices = deque()
+        self._clear_ma_state()
         self.last_crossover = None  # 'bullish' or 'bearish'
         
-        logger.info(f"Initialized Moving Average Crossover strategy with fast_period={fast_period}, slow_period={slow_period}")
+        self._apply_parameters()
+        
+        logger.info(f"Initialized Moving Average Crossover strategy with fast_period={fast_period}, slow_period={slow_period}, ma_type={ma_type}")
     
-    def execute(self, current_price: float, in_position: bool) -> Optional[TradeSignal]:
+    def execute(self, current_price: float, in_position: bool, timestamp: Optional[int] = None) -> Optional[TradeSignal]:
         """
         Execute the strategy and generate a trading signal.
         
         Args:
             current_price: Current price of the asset
             in_position: Whether we currently hold a position
+            timestamp: Unix timestamp of the market data being acted on; defaults to the current time
             
         Returns:
             A TradeSignal object or None if no action should be taken
@@ -57,49 +74,45 @@ class MovingAverageCrossover(TradeStrategyInterface):
         if len(self.fast_ma) < 2 or len(self.slow_ma) < 2:
             return None
         
-        # Check for crossover
-        current_fast = self.fast_ma[-1]
-        current_slow = self.slow_ma[-1]
-        previous_fast = self.fast_ma[-2]
-        previous_slow = self.slow_ma[-2]
+        # Check for crossover as a sign change of (fast - slow)
+        direction, _ = crossover(self.fast_ma[-2], self.fast_ma[-1], self.slow_ma[-2], self.slow_ma[-1])
         
-        # Bullish crossover (fast crosses above slow)
-        if previous_fast <= previous_slow and current_fast > current_slow:
-            if not in_position:
-                logger.info(f"Bullish crossover detected at price {current_price}")
-                self.last_crossover = 'bullish'
-                return TradeSignal(TradeSignal.BUY, current_price, int(time.time()))
+        # Bullish crossovers only open a position, bearish ones only close it
+        if not direction or (direction > 0) == in_position:
+            return None
         
-        # Bearish crossover (fast crosses below slow)
-        elif previous_fast >= previous_slow and current_fast < current_slow:
-            if in_position:
-                logger.info(f"Bearish crossover detected at price {current_price}")
-                self.last_crossover = 'bearish'
-                return TradeSignal(TradeSignal.SELL, current_price, int(time.time()))
+        if direction > 0:
+            logger.info("Bullish crossover detected at price %s", current_price)
+            self.last_crossover = 'bullish'
+            return TradeSignal(_BUY, current_price, int(time.time()) if timestamp is None else timestamp)
         
-        return None
+        logger.info("Bearish crossover detected at price %s", current_price)
+        self.last_crossover = 'bearish'
+        return TradeSignal(_SELL, current_price, int(time.time()) if timestamp is None else timestamp)
     
     def feed_ohlc(self, ohlc_data: List[Dict[str, Union[float, int]]]):
         """
         Feed OHLC data to the strategy and update moving averages.
         
         Args:
-            ohlc_data: List of OHLC candles
+            ohlc_data: List of OHLC candles or a columnar frame with a 'close' column
         """
         # Extract close prices
-        self.prices = [candle['close'] for candle in ohlc_data]
+        closes = close_prices(ohlc_data)
+        self.prices = deque(closes.tolist(), maxlen=self._max_prices)
         
-        # Calculate moving averages
-        self._calculate_moving_averages()
+        # Calculate moving averages and seed the incremental state
+        self._clear_ma_state()
+        self._calculate_moving_averages(closes)
         
-        logger.debug(f"Fed {len(ohlc_data)} OHLC candles to Moving Average Crossover strategy")
+        logger.debug("Fed %d OHLC candles to Moving Average Crossover strategy", len(ohlc_data))
     
-    def feed_depth(self, depth_data: Dict[str, List[List[float]]]):
+    def feed_depth(self, depth_data: Dict[str, np.ndarray]):
         """
         Feed market depth data to the strategy.
         
         Args:
-            depth_data: Market depth data with 'bids' and 'asks' lists
+            depth_data: Market depth data with 'bids' and 'asks' arrays of (price, quantity) rows
         """
         # This strategy doesn't use depth data
         pass
@@ -113,56 +126,172 @@ class MovingAverageCrossover(TradeStrategyInterface):
             quantity: Last trade quantity
             volume: Current volume
         """
-        # Add price to prices list
+        # Add price to the bounded price buffer
         self.prices.append(price)
         
-        # Keep only the necessary number of prices
-        max_period = max(self.parameters["fast_period"], self.parameters["slow_period"])
-        if len(self.prices) > max_period * 2:  # Keep some extra for calculation
-            self.prices = self.prices[-max_period*2:]
+        if self._use_ema:
+            # Until the EMAs are seeded, recalculate from the price buffer
+            if self._slow_ema is None:
+                self._calculate_moving_averages()
+                return
+            
+            # Afterwards, apply one step of the EMA recurrence
+            self._update_exponential_averages(price)
+            return
         
-        # Recalculate moving averages
-        self._calculate_moving_averages()
+        # Until the running sums are seeded, recalculate from the price buffer
+        if self._slow_sum is None:
+            self._calculate_moving_averages()
+            return
+        
+        # Afterwards, slide both windows by one price
+        self._update_moving_averages(price)
     
-    def _calculate_moving_averages(self):
+    def _update_moving_averages(self, price: float):
+        """
+        Append the next fast and slow moving average values using the running sums.
+        
+        Args:
+            price: Newest price, already appended to the price buffer
         """
-        Calculate fast and slow moving averages from prices.
+        # Add the new price and drop the one leaving each window
+        self._fast_sum += price - self.prices[-self._fast_period - 1]
+        self._slow_sum += price - self.prices[-self._slow_period - 1]
+        
+        self.fast_ma.append(self._fast_sum * self._inv_fast)
+        self.slow_ma.append(self._slow_sum * self._inv_slow)
+    
+    def _update_exponential_averages(self, price: float):
+        """
+        Append the next fast and slow EMA values.
+        
+        Args:
+            price: Newest price
+        """
+        self._fast_ema = price * self._alpha_fast + self._fast_ema * self._one_minus_alpha_fast
+        self._slow_ema = price * self._alpha_slow + self._slow_ema * self._one_minus_alpha_slow
+        
+        self.fast_ma.append(self._fast_ema)
+        self.slow_ma.append(self._slow_ema)
+    
+    def _calculate_moving_averages(self, prices: Optional[np.ndarray] = None):
+        """
+        Calculate fast and slow moving averages from prices and seed the running sums
+        (or the last EMA values when ma_type is "ema").
+        
+        Args:
+            prices: Price array to use instead of converting the price buffer
         """
-        fast_period = self.parameters["fast_period"]
-        slow_period = self.parameters["slow_period"]
+        fast_period = self._fast_period
+        slow_period = self._slow_period
         
         # Need enough prices to calculate both MAs
         if len(self.prices) >= slow_period:
-            # Calculate fast MA
-            self.fast_ma = self._calculate_simple_ma(self.prices, fast_period)
+            if prices is None:
+                prices = np.fromiter(self.prices, dtype=np.float64, count=len(self.prices))
             
-            # Calculate slow MA
-            self.slow_ma = self._calculate_simple_ma(self.prices, slow_period)
+            if self._use_ema:
+                fast_ema = ema_recurrence(np.ascontiguousarray(prices), fast_period, self._alpha_fast)
+                slow_ema = ema_recurrence(np.ascontiguousarray(prices), slow_period, self._alpha_slow)
+                
+                self.fast_ma = deque(fast_ema[-self.HISTORY_SIZE:].tolist(), maxlen=self.HISTORY_SIZE)
+                self.slow_ma = deque(slow_ema[-self.HISTORY_SIZE:].tolist(), maxlen=self.HISTORY_SIZE)
+                
+                self._fast_ema = self.fast_ma[-1]
+                self._slow_ema = self.slow_ma[-1]
+                return
+            
+            # Cumulative sum with a leading zero, shared by both MAs
+            cumsum = np.empty(prices.size + 1, dtype=np.float64)
+            cumsum[0] = 0.0
+            np.cumsum(prices, out=cumsum[1:])
+            
+            # Only the last HISTORY_SIZE values are kept for crossover detection
+            fast_ma = self._calculate_simple_ma(cumsum, fast_period)
+            slow_ma = self._calculate_simple_ma(cumsum, slow_period)
+            self.fast_ma = deque(fast_ma[-self.HISTORY_SIZE:].tolist(), maxlen=self.HISTORY_SIZE)
+            self.slow_ma = deque(slow_ma[-self.HISTORY_SIZE:].tolist(), maxlen=self.HISTORY_SIZE)
+            
+            self._fast_sum = float(prices[-fast_period:].sum())
+            self._slow_sum = float(prices[-slow_period:].sum())
     
     @staticmethod
-    def _calculate_simple_ma(data: List[float], period: int) -> List[float]:
+    def _calculate_simple_ma(cumsum: np.ndarray, period: int) -> np.ndarray:
         """
         Calculate Simple Moving Average.
         
         Args:
-            data: List of price data
+            cumsum: Cumulative sum of the price data, starting with 0
             period: MA period
             
         Returns:
-            List of moving average values
+            Array of moving average values
+        """
+        # Each window sum is the difference of two cumulative sums
+        return (cumsum[period:] - cumsum[:-period]) * (1.0 / period)
+    
+    def set_parameters(self, parameters: Dict[str, any]):
+        """
+        Set strategy parameters.
+        
+        Args:
+            parameters: Dictionary of parameter name-value pairs
+            
+        Raises:
+            ValueError: If ma_type is not one of MA_TYPES; the parameters are left unchanged
+        """
+        if "ma_type" in parameters:
+            self._check_ma_type(parameters["ma_type"])
+        super().set_parameters(parameters)
+    
+    @classmethod
+    def _check_ma_type(cls, ma_type: str):
         """
-        result = []
-        for i in range(len(data) - period + 1):
-            window = data[i:i+period]
-            result.append(sum(window) / period)
-        return result
+        Raise ValueError if ma_type is not one of MA_TYPES.
+        """
+        if ma_type not in cls.MA_TYPES:
+            raise ValueError(f"Unknown moving average type: {ma_type}")
+    
+    def _apply_parameters(self):
+        """
+        Cache the periods and reseed the running sums for the new periods.
+        """
+        self._use_ema = self.parameters.get("ma_type", "sma") == "ema"
+        self._fast_period = self.parameters["fast_period"]
+        self._slow_period = self.parameters["slow_period"]
+        self._inv_fast = 1.0 / self._fast_period
+        self._inv_slow = 1.0 / self._slow_period
+        self._alpha_fast = 2.0 / (self._fast_period + 1)
+        self._alpha_slow = 2.0 / (self._slow_period + 1)
+        self._one_minus_alpha_fast = 1.0 - self._alpha_fast
+        self._one_minus_alpha_slow = 1.0 - self._alpha_slow
+        self._max_prices = max(self._fast_period, self._slow_period) * 2  # Keep some extra for calculation
+        self.prices = deque(self.prices, maxlen=self._max_prices)
+        
+        # Drop the MA values of the old periods; they stay empty if the buffer is too short
+        self._clear_ma_state()
+        self._calculate_moving_averages()
+    
+    def _clear_ma_state(self):
+        """
+        Clear the fast/slow MA buffers and the running sums and EMA values.
+        """
+        self.fast_ma = deque(maxlen=self.HISTORY_SIZE)
+        self.slow_ma = deque(maxlen=self.HISTORY_SIZE)
+        
+        # Running sums of the last fast_period / slow_period prices
+        self._fast_sum = None
+        self._slow_sum = None
+        
+        # Last fast / slow EMA values when ma_type is "ema"
+        self._fast_ema = None
+        self._slow_ema = None
     
     def reset(self):
         """
         Reset the strategy state.
         """
         super().reset()
-        self.prices = []
-        self.fast_ma = []
-        self.slow_ma = []
+        self.prices.clear()
+        self._clear_ma_state()
         self.last_crossover = None
@@ -7,17 +7,26 @@ A strategy that generates buy signals when RSI is oversold and sell signals when
 
 import time
 import logging
+from collections import deque
 import numpy as np
 from typing import Dict, List, Optional, Union
 
-from strategy_interface import TradeStrategyInterface, TradeSignal
+from strategy_interface import TradeStrategyInterface, TradeSignal, close_prices
+from .kernels import rsi_value, wilder_rsi
 
 logger = logging.getLogger(__name__)
 
+# Signal types, bound once for the signal paths
+_BUY = TradeSignal.BUY
+_SELL = TradeSignal.SELL
+
 
 class RSIStrategy(TradeStrategyInterface):
     """RSI (Relative Strength Index) Strategy."""
     
+    # Number of RSI values kept; execute() only reads the latest one
+    HISTORY_SIZE = 2
+    
     def __init__(self, period: int = 14, oversold: int = 30, overbought: int = 70):
         """
         Initialize the strategy.
@@ -35,20 +44,29 @@ class RSIStrategy(TradeStrategyInterface):
             "overbought": overbought
         }
         
-        # Initialize data storage
-        self.prices = []
-        self.rsi_values = []
+        # Initialize data storage (bounded by _apply_parameters)
+        self.prices = deque()
+        self.rsi_values = deque(maxlen=self.HISTORY_SIZE)
         self.last_action = None  # 'buy' or 'sell'
         
+        # Wilder-smoothed average gain / loss carried across ticks
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._prev_price = None
+        self._rsi_seeded = False
+        
+        self._apply_parameters()
+        
         logger.info(f"Initialized RSI strategy with period={period}, oversold={oversold}, overbought={overbought}")
     
-    def execute(self, current_price: float, in_position: bool) -> Optional[TradeSignal]:
+    def execute(self, current_price: float, in_position: bool, timestamp: Optional[int] = None) -> Optional[TradeSignal]:
         """
         Execute the strategy and generate a trading signal.
         
         Args:
             current_price: Current price of the asset
             in_position: Whether we currently hold a position
+            timestamp: Unix timestamp of the market data being acted on; defaults to the current time
             
         Returns:
             A TradeSignal object or None if no action should be taken
@@ -58,22 +76,24 @@ class RSIStrategy(TradeStrategyInterface):
             return None
         
         current_rsi = self.rsi_values[-1]
+        oversold = self._oversold
+        overbought = self._overbought
         
         # Buy when RSI is oversold
-        if current_rsi <= self.parameters["oversold"] and not in_position and self.last_action != 'buy':
-            logger.info(f"Oversold condition detected: RSI = {current_rsi} at price {current_price}")
+        if current_rsi <= oversold and not in_position and self.last_action != 'buy':
+            logger.info("Oversold condition detected: RSI = %s at price %s", current_rsi, current_price)
             self.last_action = 'buy'
-            confidence = 1.0 - (current_rsi / self.parameters["oversold"])  # Higher confidence when RSI is lower
+            confidence = 1.0 - (current_rsi / oversold)  # Higher confidence when RSI is lower
             confidence = max(0.1, min(confidence, 1.0))  # Clamp between 0.1 and 1.0
-            return TradeSignal(TradeSignal.BUY, current_price, int(time.time()), confidence)
+            return TradeSignal(_BUY, current_price, int(time.time()) if timestamp is None else timestamp, confidence)
         
         # Sell when RSI is overbought
-        elif current_rsi >= self.parameters["overbought"] and in_position and self.last_action != 'sell':
-            logger.info(f"Overbought condition detected: RSI = {current_rsi} at price {current_price}")
+        elif current_rsi >= overbought and in_position and self.last_action != 'sell':
+            logger.info("Overbought condition detected: RSI = %s at price %s", current_rsi, current_price)
             self.last_action = 'sell'
-            confidence = (current_rsi - self.parameters["overbought"]) / (100 - self.parameters["overbought"])  # Higher confidence when RSI is higher
+            confidence = (current_rsi - overbought) / (100 - overbought)  # Higher confidence when RSI is higher
             confidence = max(0.1, min(confidence, 1.0))  # Clamp between 0.1 and 1.0
-            return TradeSignal(TradeSignal.SELL, current_price, int(time.time()), confidence)
+            return TradeSignal(_SELL, current_price, int(time.time()) if timestamp is None else timestamp, confidence)
         
         return None
     
@@ -82,22 +102,24 @@ class RSIStrategy(TradeStrategyInterface):
         Feed OHLC data to the strategy and update RSI.
         
         Args:
-            ohlc_data: List of OHLC candles
+            ohlc_data: List of OHLC candles or a columnar frame with a 'close' column
         """
         # Extract close prices
-        self.prices = [candle['close'] for candle in ohlc_data]
+        closes = close_prices(ohlc_data)
+        self.prices = deque(closes.tolist(), maxlen=self._max_prices)
         
-        # Calculate RSI
-        self._calculate_rsi()
+        # Calculate RSI over the full history and seed the smoothed averages
+        self._rsi_seeded = False
+        self._calculate_rsi(closes)
         
-        logger.debug(f"Fed {len(ohlc_data)} OHLC candles to RSI strategy")
+        logger.debug("Fed %d OHLC candles to RSI strategy", len(ohlc_data))
     
-    def feed_depth(self, depth_data: Dict[str, List[List[float]]]):
+    def feed_depth(self, depth_data: Dict[str, np.ndarray]):
         """
         Feed market depth data to the strategy.
         
         Args:
-            depth_data: Market depth data with 'bids' and 'asks' lists
+            depth_data: Market depth data with 'bids' and 'asks' arrays of (price, quantity) rows
         """
         # This strategy doesn't use depth data
         pass
@@ -111,58 +133,98 @@ class RSIStrategy(TradeStrategyInterface):
             quantity: Last trade quantity
             volume: Current volume
         """
-        # Add price to prices list
+        # Add price to the bounded price buffer
         self.prices.append(price)
         
-        # Keep only the necessary number of prices
-        period = self.parameters["period"]
-        if len(self.prices) > period * 3:  # Keep some extra for calculation
-            self.prices = self.prices[-period*3:]
+        # Until the averages are seeded, recalculate from the price buffer
+        if not self._rsi_seeded:
+            self._calculate_rsi()
+            return
         
-        # Recalculate RSI
-        self._calculate_rsi()
+        # Afterwards, apply one step of Wilder smoothing
+        self._update_rsi(price)
     
-    def _calculate_rsi(self):
+    def _update_rsi(self, price: float):
         """
-        Calculate RSI from prices.
-        """
-        period = self.parameters["period"]
-        
-        # Need at least period+1 prices to calculate RSI
-        if len(self.prices) <= period:
-            return
-        
-        # Calculate price changes
-        deltas = np.diff(self.prices)
+        Append the next RSI value using the smoothed average gain and loss.
         
-        # Split gains and losses
-        gains = np.clip(deltas, 0, None)
-        losses = np.clip(-deltas, 0, None)
+        Args:
+            price: Newest price
+        """
+        delta = price - self._prev_price
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self._prev_price = price
         
-        # Calculate average gains and losses
-        avg_gain = []
-        avg_loss = []
+        self._avg_gain = (self._avg_gain * self._period_minus_one + gain) * self._inv_period
+        self._avg_loss = (self._avg_loss * self._period_minus_one + loss) * self._inv_period
         
-        # First average is simple average
-        avg_gain.append(np.sum(gains[:period]) / period)
-        avg_loss.append(np.sum(losses[:period]) / period)
+        self.rsi_values.append(rsi_value(self._avg_gain, self._avg_loss))
+    
+    def _calculate_rsi(self, prices: Optional[np.ndarray] = None):
+        """
+        Calculate RSI from prices and seed the smoothed averages.
         
-        # Subsequent averages use smoothing formula
-        for i in range(period, len(deltas)):
-            avg_gain.append((avg_gain[-1] * (period - 1) + gains[i]) / period)
-            avg_loss.append((avg_loss[-1] * (period - 1) + losses[i]) / period)
+        Args:
+            prices: Price array to use instead of converting the price buffer
+        """
+        period = self._period
         
-        # Calculate RS and RSI
-        rs = np.array(avg_gain) / np.array(avg_loss)
-        rsi = 100 - (100 / (1 + rs))
+        # Need at least period+1 prices to calculate RSI
+        if len(self.prices) <= period:
+            return
         
-        self.rsi_values = rsi.tolist()
+        if prices is None:
+            # The price buffer never exceeds the preallocated work buffers
+            n = len(self.prices)
+            prices = self._price_work[:n]
+            prices[:] = self.prices
+            rsi = self._rsi_work[:n - period]
+        else:
+            prices = np.ascontiguousarray(prices, dtype=np.float64)
+            rsi = np.empty(len(prices) - period, dtype=np.float64)
+        
+        # Split price changes into gains and losses, smooth them and convert to RSI
+        avg_gain, avg_loss = wilder_rsi(prices, period, rsi)
+        
+        # Only the last HISTORY_SIZE values are kept
+        self.rsi_values = deque(rsi[-self.HISTORY_SIZE:].tolist(), maxlen=self.HISTORY_SIZE)
+        
+        self._avg_gain = float(avg_gain)
+        self._avg_loss = float(avg_loss)
+        self._prev_price = self.prices[-1]
+        self._rsi_seeded = True
+    
+    def _apply_parameters(self):
+        """
+        Cache the period and thresholds and reseed the smoothed averages.
+        """
+        self._period = self.parameters["period"]
+        self._oversold = self.parameters["oversold"]
+        self._overbought = self.parameters["overbought"]
+        self._inv_period = 1.0 / self._period
+        self._period_minus_one = self._period - 1
+        self._max_prices = self._period * 3  # Keep some extra for calculation
+        self.prices = deque(self.prices, maxlen=self._max_prices)
+        
+        # Work buffers for recalculating RSI from the price buffer
+        self._price_work = np.empty(self._max_prices, dtype=np.float64)
+        self._rsi_work = np.empty(self._max_prices, dtype=np.float64)
+        
+        # Drop the RSI values of the old period; they stay empty if the buffer is too short
+        self.rsi_values.clear()
+        self._rsi_seeded = False
+        self._calculate_rsi()
     
     def reset(self):
         """
         Reset the strategy state.
         """
         super().reset()
-        self.prices = []
-        self.rsi_values = []
+        self.prices.clear()
+        self.rsi_values.clear()
         self.last_action = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._prev_price = None
+        self._rsi_seeded = False
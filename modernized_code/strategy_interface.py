@@ -6,15 +6,35 @@ Defines the interface that all trading strategies must implement.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+def close_prices(ohlc_data: Any) -> np.ndarray:
+    """
+    Extract close prices from OHLC data.
+    
+    Args:
+        ohlc_data: List of OHLC candles, or a columnar frame (e.g. a pandas
+            DataFrame or a dict of arrays) with a 'close' column
+            
+    Returns:
+        Close prices as a float64 array
+    """
+    if isinstance(ohlc_data, list):
+        return np.fromiter((candle['close'] for candle in ohlc_data), dtype=np.float64, count=len(ohlc_data))
+    return np.asarray(ohlc_data['close'], dtype=np.float64)
+
+
 class TradeSignal:
     """Represents a trading signal generated by a strategy."""
     
+    # Fixed attribute layout: no per-instance __dict__
+    __slots__ = ("type", "price", "timestamp", "confidence")
+    
     BUY = "BUY"
     SELL = "SELL"
     HOLD = "HOLD"
@@ -54,13 +74,14 @@ class TradeStrategyInterface(ABC):
         logger.info(f"Initialized strategy: {name}")
     
     @abstractmethod
-    def execute(self, current_price: float, in_position: bool) -> Optional[TradeSignal]:
+    def execute(self, current_price: float, in_position: bool, timestamp: Optional[int] = None) -> Optional[TradeSignal]:
         """
         Execute the strategy and generate a trading signal.
         
         Args:
             current_price: Current price of the asset
             in_position: Whether we currently hold a position
+            timestamp: Unix timestamp of the market data being acted on; defaults to the current time
             
         Returns:
             A TradeSignal object or None if no action should be taken
@@ -73,17 +94,18 @@ class TradeStrategyInterface(ABC):
         Feed OHLC (Open-High-Low-Close) data to the strategy.
         
         Args:
-            ohlc_data: List of OHLC candles with keys 'open', 'high', 'low', 'close', 'volume', 'timestamp'
+            ohlc_data: List of OHLC candles with keys 'open', 'high', 'low', 'close', 'volume', 'timestamp',
+                or a columnar frame with the same columns
         """
         pass
     
     @abstractmethod
-    def feed_depth(self, depth_data: Dict[str, List[List[float]]]):
+    def feed_depth(self, depth_data: Dict[str, np.ndarray]):
         """
         Feed market depth data to the strategy.
         
         Args:
-            depth_data: Market depth data with 'bids' and 'asks' lists
+            depth_data: Market depth data with 'bids' and 'asks' arrays of (price, quantity) rows
         """
         pass
     
@@ -107,8 +129,18 @@ class TradeStrategyInterface(ABC):
             parameters: Dictionary of parameter name-value pairs
         """
         self.parameters.update(parameters)
+        self._apply_parameters()
         logger.info(f"Updated parameters for {self.name}: {parameters}")
     
+    def _apply_parameters(self):
+        """
+        Refresh values derived from the strategy parameters.
+        
+        Called whenever the parameters change. Strategies that cache derived
+        values (periods, smoothing factors, buffer sizes) override this.
+        """
+        pass
+    
     def get_parameters(self) -> Dict[str, any]:
         """
         Get current strategy parameters.
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tick Buffer Module
+
+Lock-free ring buffer that hands WebSocket trade ticks over to the strategy thread.
+"""
+
+import logging
+from threading import Event
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TickRingBuffer:
+    """
+    Single-producer single-consumer ring buffer of trade ticks.
+    
+    The WebSocket thread pushes one row per trade and the strategy thread pops
+    them in batches. Each side only writes its own index, so no lock is needed.
+    """
+    
+    # Column layout of a tick row
+    TIMESTAMP = 0
+    PRICE = 1
+    QUANTITY = 2
+    VOLUME = 3
+    
+    def __init__(self, capacity: int = 4096):
+        """
+        Initialize the ring buffer.
+        
+        Args:
+            capacity: Maximum number of ticks held before new ones are dropped
+        """
+        self.capacity = capacity
+        self._rows = np.zeros((capacity, 4), dtype=np.float64)
+        
+        # Total number of rows written (producer) and read (consumer)
+        self._head = 0
+        self._tail = 0
+        
+        self.dropped = 0
+        self._data_ready = Event()
+    
+    def __len__(self) -> int:
+        return self._head - self._tail
+    
+    def push(self, timestamp: float, price: float, quantity: float, volume: float) -> bool:
+        """
+        Append a tick. Must only be called from the producer thread.
+        
+        Args:
+            timestamp: Trade time in milliseconds
+            price: Trade price
+            quantity: Trade quantity
+            volume: Trade volume (price * quantity)
+            
+        Returns:
+            False if the buffer was full and the tick was dropped
+        """
+        head = self._head
+        if head - self._tail >= self.capacity:
+            self.dropped += 1
+            return False
+        
+        self._rows[head % self.capacity] = (timestamp, price, quantity, volume)
+        
+        # Publish the row only after it has been written
+        self._head = head + 1
+        self._data_ready.set()
+        return True
+    
+    def wait(self, timeout: float) -> bool:
+        """
+        Wait until ticks are available. Must only be called from the consumer thread.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            True if ticks may be available
+        """
+        ready = self._data_ready.wait(timeout)
+        
+        # Cleared before reading, so a push racing with this call sets it again
+        self._data_ready.clear()
+        return ready
+    
+    def pop_batch(self, max_rows: int) -> np.ndarray:
+        """
+        Remove up to max_rows of the oldest ticks. Must only be called from the consumer thread.
+        
+        Args:
+            max_rows: Maximum number of ticks to return
+            
+        Returns:
+            Array of shape (n, 4) with the TIMESTAMP, PRICE, QUANTITY and VOLUME columns
+        """
+        tail = self._tail
+        count = min(self._head - tail, max_rows)
+        if count <= 0:
+            return np.empty((0, 4), dtype=np.float64)
+        
+        start = tail % self.capacity
+        end = start + count
+        if end <= self.capacity:
+            batch = self._rows[start:end].copy()
+        else:
+            batch = np.concatenate((self._rows[start:], self._rows[:end - self.capacity]))
+        
+        # Release the slots only after they have been copied
+        self._tail = tail + count
+        return batch
@@ -7,12 +7,14 @@ Handles trading logic, including order execution and position management.
 
 import time
 import logging
+from array import array
 from typing import Dict, List, Optional, Union
 from datetime import datetime
-from threading import Thread, Event, Lock
+from threading import Thread, Event, Lock, RLock
 
 from data_provider import BinanceDataProvider
 from strategy_interface import TradeStrategyInterface, TradeSignal
+from tick_buffer import TickRingBuffer
 from account import Account, SimulatedAccount, BinanceAccount
 
 logger = logging.getLogger(__name__)
@@ -21,6 +23,13 @@ logger = logging.getLogger(__name__)
 class TradingBot:
     """Trading bot that executes strategies on market data."""
     
+    # Maximum number of ticks handed to the strategy in one batch
+    TICK_BATCH_SIZE = 256
+    
+    # Trade type codes stored in the trade log
+    TRADE_BUY = 1
+    TRADE_SELL = -1
+    
     def __init__(self, symbol: str, use_real_account: bool = False, api_key: str = "", api_secret: str = "", testnet: bool = True):
         """
         Initialize the trading bot.
@@ -54,11 +63,34 @@ class TradingBot:
         self.strategy = None
         self.running = False
         self.stop_event = Event()
-        self.trading_thread = None
-        self.lock = Lock()
         
-        # Performance tracking
-        self.trades = []
+        # Guards the running flag and the trade log
+        self.lock = RLock()
+        
+        # Serializes strategy updates from the WebSocket and tick threads
+        self._strategy_lock = Lock()
+        
+        # Trades from the WebSocket thread, consumed by the tick thread,
+        # which feeds them to the strategy and executes it after each trade
+        self.tick_buffer = TickRingBuffer()
+        self.tick_thread = None
+        
+        # Last traded price seen on the trade stream
+        self._last_price = None
+        
+        # Performance tracking: trade log stored as parallel columns
+        self._trade_types = array('b')
+        self._trade_prices = array('d')
+        self._trade_quantities = array('d')
+        self._trade_profits = array('d')
+        self._trade_timestamps = array('q')
+        self._trade_manual = array('b')
+        
+        # Running trade counters, updated as trades are recorded
+        self._num_buys = 0
+        self._num_sells = 0
+        self._num_wins = 0
+        self._total_profit = 0.0
         self.start_balance = self.account.get_balance()
         
         logger.info(f"Initialized trading bot for {symbol} (real account: {use_real_account})")
@@ -85,9 +117,18 @@ class TradingBot:
                 logger.warning("Trading bot is already running")
                 return
             
+            # Discard trades left over from the previous run; they are stale now
+            self.tick_buffer = TickRingBuffer()
             self.running = True
             self.stop_event.clear()
         
+        # Seed the last price until the first trade arrives on the stream
+        try:
+            self._last_price = self.data_provider.get_current_price(self.symbol) or None
+        except Exception as e:
+            logger.warning(f"Could not fetch initial price: {str(e)}")
+            self._last_price = None
+        
         # Connect to WebSocket for real-time data
         self.data_provider.connect_websocket(self.symbol, {
             "kline": self._on_kline,
@@ -95,10 +136,10 @@ class TradingBot:
             "depth": self._on_depth
         })
         
-        # Start trading thread
-        self.trading_thread = Thread(target=self._trading_loop)
-        self.trading_thread.daemon = True
-        self.trading_thread.start()
+        # Start tick thread feeding trades to the strategy and executing it
+        self.tick_thread = Thread(target=self._tick_loop)
+        self.tick_thread.daemon = True
+        self.tick_thread.start()
         
         logger.info(f"Trading bot started with {self.strategy.name} strategy")
     
@@ -117,40 +158,68 @@ class TradingBot:
         # Disconnect from WebSocket
         self.data_provider.disconnect_websocket()
         
-        # Wait for trading thread to finish
-        if self.trading_thread and self.trading_thread.is_alive():
-            self.trading_thread.join(timeout=5.0)
+        # Wait for the tick thread to finish
+        if self.tick_thread and self.tick_thread.is_alive():
+            self.tick_thread.join(timeout=5.0)
         
         logger.info("Trading bot stopped")
         
         # Log performance summary
         self._log_performance_summary()
     
-    def _trading_loop(self):
+    def _tick_loop(self):
         """
-        Main trading loop.
+        Feed buffered trades to the strategy and execute it after each trade.
+        
+        Trading decisions are driven by the WebSocket trade stream; trades are
+        drained from the ring buffer in batches, but every trade is fed and
+        acted on individually so no crossover within a batch is missed.
         """
         while not self.stop_event.is_set():
+            if not self.tick_buffer.wait(timeout=0.5):
+                continue
+            
             try:
-                # Get current price
-                current_price = self.data_provider.get_current_price(self.symbol)
-                
-                # Check if we have a position
-                in_position = self.account.has_position(self.symbol)
-                
-                # Execute strategy
-                signal = self.strategy.execute(current_price, in_position)
-                
-                # Process signal
-                if signal:
-                    self._process_signal(signal)
-                
-                # Sleep to avoid excessive CPU usage
-                time.sleep(1.0)
-                
+                while True:
+                    batch = self.tick_buffer.pop_batch(self.TICK_BATCH_SIZE)
+                    if not len(batch):
+                        break
+                    
+                    self._execute_batch(batch)
+            
             except Exception as e:
-                logger.error(f"Error in trading loop: {str(e)}")
-                time.sleep(5.0)  # Sleep longer on error
+                logger.error(f"Error in tick loop: {str(e)}")
+    
+    def _execute_batch(self, batch):
+        """
+        Feed a batch of ticks to the strategy one by one, executing it after each tick.
+        
+        Args:
+            batch: Tick rows as returned by TickRingBuffer.pop_batch
+        """
+        timestamps = batch[:, TickRingBuffer.TIMESTAMP].tolist()
+        prices = batch[:, TickRingBuffer.PRICE].tolist()
+        quantities = batch[:, TickRingBuffer.QUANTITY].tolist()
+        volumes = batch[:, TickRingBuffer.VOLUME].tolist()
+        
+        in_position = self.account.has_position(self.symbol)
+        strategy = self.strategy
+        i = 0
+        while i < len(prices):
+            signal = None
+            
+            # Feed and execute tick by tick until a signal fires
+            with self._strategy_lock:
+                while i < len(prices) and not signal:
+                    price = prices[i]
+                    strategy.feed_price_quantity_volume(price, quantities[i], volumes[i])
+                    signal = strategy.execute(price, in_position, int(timestamps[i]) // 1000)  # Exchange trade time
+                    i += 1
+            
+            # Process signal outside the lock; orders may block on REST calls
+            if signal:
+                self._process_signal(signal)
+                in_position = self.account.has_position(self.symbol)
     
     def _process_signal(self, signal: TradeSignal):
         """
@@ -165,15 +234,13 @@ class TradingBot:
                 order_result = self.account.buy(self.symbol, signal.price)
                 
                 if order_result["success"]:
-                    logger.info(f"Buy order executed at {signal.price}")
+                    logger.info("Buy order executed at %s", signal.price)
                     
                     # Record trade
-                    self.trades.append({
-                        "type": "BUY",
-                        "price": signal.price,
-                        "timestamp": signal.timestamp,
-                        "quantity": order_result.get("quantity", 0.0)
-                    })
+                    self._record_trade(
+                        self.TRADE_BUY, signal.price, signal.timestamp,
+                        order_result.get("quantity", 0.0)
+                    )
                 else:
                     logger.error(f"Buy order failed: {order_result.get('error', 'Unknown error')}")
             
@@ -182,22 +249,87 @@ class TradingBot:
                 order_result = self.account.sell(self.symbol, signal.price)
                 
                 if order_result["success"]:
-                    logger.info(f"Sell order executed at {signal.price}")
+                    logger.info("Sell order executed at %s", signal.price)
                     
                     # Record trade
-                    self.trades.append({
-                        "type": "SELL",
-                        "price": signal.price,
-                        "timestamp": signal.timestamp,
-                        "quantity": order_result.get("quantity", 0.0),
-                        "profit": order_result.get("profit", 0.0)
-                    })
+                    self._record_trade(
+                        self.TRADE_SELL, signal.price, signal.timestamp,
+                        order_result.get("quantity", 0.0), order_result.get("profit", 0.0)
+                    )
                 else:
                     logger.error(f"Sell order failed: {order_result.get('error', 'Unknown error')}")
         
         except Exception as e:
             logger.error(f"Error processing signal: {str(e)}")
     
+    def _record_trade(self, trade_type: int, price: float, timestamp: int, quantity: float,
+                      profit: float = 0.0, manual: bool = False):
+        """
+        Append an executed trade to the trade log.
+        
+        Args:
+            trade_type: TRADE_BUY or TRADE_SELL
+            price: Execution price
+            timestamp: Unix timestamp of the trade
+            quantity: Traded quantity
+            profit: Realized profit (sell trades only)
+            manual: Whether the trade was placed manually
+        """
+        with self.lock:
+            self._trade_types.append(trade_type)
+            self._trade_prices.append(price)
+            self._trade_quantities.append(quantity)
+            self._trade_profits.append(profit)
+            self._trade_timestamps.append(int(timestamp))
+            self._trade_manual.append(manual)
+            
+            if trade_type == self.TRADE_BUY:
+                self._num_buys += 1
+            else:
+                self._num_sells += 1
+                self._total_profit += profit
+                if profit > 0.0:
+                    self._num_wins += 1
+    
+    @property
+    def trades(self) -> List[Dict]:
+        """
+        Executed trades as a list of dictionaries, oldest first.
+        
+        Built on demand from a snapshot of the trade log columns.
+        """
+        with self.lock:
+            columns = (
+                self._trade_types[:], self._trade_prices[:], self._trade_timestamps[:],
+                self._trade_quantities[:], self._trade_profits[:], self._trade_manual[:]
+            )
+        
+        trades = []
+        for trade_type, price, timestamp, quantity, profit, manual in zip(*columns):
+            trade = {
+                "type": "BUY" if trade_type == self.TRADE_BUY else "SELL",
+                "price": price,
+                "timestamp": timestamp,
+                "quantity": quantity
+            }
+            if trade_type == self.TRADE_SELL:
+                trade["profit"] = profit
+            if manual:
+                trade["manual"] = True
+            trades.append(trade)
+        return trades
+    
+    def _trade_counts(self) -> tuple:
+        """
+        Read the running trade counters.
+        
+        Returns:
+            Tuple of (number of trades, buy trades, sell trades, winning sell trades,
+            realized profit of the sell trades)
+        """
+        with self.lock:
+            return len(self._trade_types), self._num_buys, self._num_sells, self._num_wins, self._total_profit
+    
     def _on_kline(self, kline: Dict):
         """
         Handle kline (candlestick) update.
@@ -208,7 +340,8 @@ class TradingBot:
         if self.strategy and self.running:
             # Only feed closed candles to strategy
             if kline.get("is_closed", False):
-                self.strategy.feed_ohlc([kline])
+                with self._strategy_lock:
+                    self.strategy.feed_ohlc([kline])
     
     def _on_trade(self, trade: Dict):
         """
@@ -218,11 +351,29 @@ class TradingBot:
             trade: Trade data
         """
         if self.strategy and self.running:
-            self.strategy.feed_price_quantity_volume(
+            self._last_price = trade["price"]
+            
+            # Hand the trade to the tick thread so slow strategy updates
+            # never hold up the WebSocket thread
+            if not self.tick_buffer.push(
+                trade["timestamp"],
                 trade["price"],
                 trade["quantity"],
                 trade["quantity"] * trade["price"]
-            )
+            ):
+                logger.warning("Tick buffer full, dropped trade at %s", trade["price"])
+    
+    def _current_price(self) -> float:
+        """
+        Get the current price, from the trade stream while the bot is running.
+        
+        Returns:
+            Last traded price, or the REST ticker price when no streamed price is available
+        """
+        last_price = self._last_price
+        if self.running and last_price:
+            return last_price
+        return self.data_provider.get_current_price(self.symbol)
     
     def _on_depth(self, depth: Dict):
         """
@@ -242,21 +393,20 @@ class TradingBot:
         profit = current_balance - self.start_balance
         profit_percent = (profit / self.start_balance) * 100
         
-        buy_trades = [t for t in self.trades if t["type"] == "BUY"]
-        sell_trades = [t for t in self.trades if t["type"] == "SELL"]
+        num_trades, num_buys, num_sells, num_wins, realized_profit = self._trade_counts()
         
         logger.info("=== Performance Summary ===")
         logger.info(f"Starting balance: {self.start_balance:.2f}")
         logger.info(f"Current balance: {current_balance:.2f}")
         logger.info(f"Profit: {profit:.2f} ({profit_percent:.2f}%)")
-        logger.info(f"Number of trades: {len(self.trades)}")
-        logger.info(f"Buy trades: {len(buy_trades)}")
-        logger.info(f"Sell trades: {len(sell_trades)}")
+        logger.info(f"Number of trades: {num_trades}")
+        logger.info(f"Buy trades: {num_buys}")
+        logger.info(f"Sell trades: {num_sells}")
+        logger.info(f"Realized profit: {realized_profit:.2f}")
         
         # Calculate win rate if we have sell trades
-        if sell_trades:
-            winning_trades = [t for t in sell_trades if t.get("profit", 0.0) > 0.0]
-            win_rate = (len(winning_trades) / len(sell_trades)) * 100
+        if num_sells:
+            win_rate = (num_wins / num_sells) * 100
             logger.info(f"Win rate: {win_rate:.2f}%")
         
         logger.info("===========================")
@@ -272,24 +422,23 @@ class TradingBot:
         profit = current_balance - self.start_balance
         profit_percent = (profit / self.start_balance) * 100
         
-        buy_trades = [t for t in self.trades if t["type"] == "BUY"]
-        sell_trades = [t for t in self.trades if t["type"] == "SELL"]
+        num_trades, num_buys, num_sells, num_wins, realized_profit = self._trade_counts()
         
         metrics = {
             "start_balance": self.start_balance,
             "current_balance": current_balance,
             "profit": profit,
             "profit_percent": profit_percent,
-            "num_trades": len(self.trades),
-            "num_buy_trades": len(buy_trades),
-            "num_sell_trades": len(sell_trades),
+            "num_trades": num_trades,
+            "num_buy_trades": num_buys,
+            "num_sell_trades": num_sells,
+            "realized_profit": realized_profit,
             "win_rate": 0.0
         }
         
         # Calculate win rate if we have sell trades
-        if sell_trades:
-            winning_trades = [t for t in sell_trades if t.get("profit", 0.0) > 0.0]
-            metrics["win_rate"] = (len(winning_trades) / len(sell_trades)) * 100
+        if num_sells:
+            metrics["win_rate"] = (num_wins / num_sells) * 100
         
         return metrics
     
@@ -300,20 +449,17 @@ class TradingBot:
         Returns:
             Order result
         """
-        current_price = self.data_provider.get_current_price(self.symbol)
+        current_price = self._current_price()
         result = self.account.buy(self.symbol, current_price)
         
         if result["success"]:
             logger.info(f"Manual buy order executed at {current_price}")
             
             # Record trade
-            self.trades.append({
-                "type": "BUY",
-                "price": current_price,
-                "timestamp": int(time.time()),
-                "quantity": result.get("quantity", 0.0),
-                "manual": True
-            })
+            self._record_trade(
+                self.TRADE_BUY, current_price, int(time.time()),
+                result.get("quantity", 0.0), manual=True
+            )
         else:
             logger.error(f"Manual buy order failed: {result.get('error', 'Unknown error')}")
         
@@ -326,21 +472,17 @@ class TradingBot:
         Returns:
             Order result
         """
-        current_price = self.data_provider.get_current_price(self.symbol)
+        current_price = self._current_price()
         result = self.account.sell(self.symbol, current_price)
         
         if result["success"]:
             logger.info(f"Manual sell order executed at {current_price}")
             
             # Record trade
-            self.trades.append({
-                "type": "SELL",
-                "price": current_price,
-                "timestamp": int(time.time()),
-                "quantity": result.get("quantity", 0.0),
-                "profit": result.get("profit", 0.0),
-                "manual": True
-            })
+            self._record_trade(
+                self.TRADE_SELL, current_price, int(time.time()),
+                result.get("quantity", 0.0), result.get("profit", 0.0), manual=True
+            )
         else:
             logger.error(f"Manual sell order failed: {result.get('error', 'Unknown error')}")
         